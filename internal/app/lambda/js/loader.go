@@ -1,16 +1,19 @@
 package js
 
 import (
-	"bytes"
+	"cmp"
 	"container/list"
 	"context"
 	"crypto/sha256"
 	"encoding/hex"
 	"errors"
 	"fmt"
+	"io"
 	"io/fs"
 	"os"
 	"path/filepath"
+	"runtime"
+	"slices"
 	"sort"
 	"strings"
 	"sync"
@@ -18,6 +21,7 @@ import (
 
 	"github.com/dop251/goja"
 	json "github.com/goccy/go-json"
+	concpool "github.com/sourcegraph/conc/pool"
 
 	"github.com/coachpo/meltica/internal/app/lambda/strategies"
 	"github.com/coachpo/meltica/internal/domain/schema"
@@ -58,17 +62,23 @@ type RegistryLocation struct {
 
 const defaultResolutionCacheSize = 256
 
+// uploadSourceName names uploaded sources while they are compiled for validation.
+const uploadSourceName = "upload.js"
+
 // Loader manages JavaScript strategy modules sourced from an external directory.
 type Loader struct {
-	mu       sync.RWMutex
-	root     string
-	registry registry
+	mu           sync.RWMutex
+	root         string
+	registry     registry
+	registryInfo fs.FileInfo // stat of registry.json when registry was decoded
 
 	files         map[string]*Module            // keyed by file path
 	byName        map[string]*Module            // default (latest) module per strategy name
 	byHash        map[string]*Module            // hash -> module
 	modulesByName map[string]map[string]*Module // name -> hash -> module
 	tags          map[string]map[string]string  // name -> tag -> hash
+	compiled      map[string]*Module            // hash -> compiled module reused across refreshes
+	fileStamps    map[string]moduleFileStamp    // file path -> stat stamp observed when last hashed
 
 	resolutionCache    map[string]*list.Element
 	resolutionOrder    *list.List
@@ -174,11 +184,14 @@ func NewLoader(root string) (*Loader, error) {
 		mu:                 sync.RWMutex{},
 		root:               clean,
 		registry:           nil,
+		registryInfo:       nil,
 		files:              make(map[string]*Module),
 		byName:             make(map[string]*Module),
 		byHash:             make(map[string]*Module),
 		modulesByName:      make(map[string]map[string]*Module),
 		tags:               make(map[string]map[string]string),
+		compiled:           make(map[string]*Module),
+		fileStamps:         make(map[string]moduleFileStamp),
 		resolutionCache:    make(map[string]*list.Element),
 		resolutionOrder:    list.New(),
 		resolutionCapacity: defaultResolutionCacheSize,
@@ -198,30 +211,74 @@ func (l *Loader) Refresh(ctx context.Context) error {
 	if l == nil {
 		return fmt.Errorf("strategy loader: nil receiver")
 	}
-	reg, err := loadRegistry(l.root)
-	if err != nil {
-		return fmt.Errorf("strategy loader: load registry: %w", err)
+	// Stat before reading so a concurrent rewrite is detected on the next refresh.
+	var info fs.FileInfo
+	if stat, err := os.Stat(filepath.Join(l.root, "registry.json")); err == nil {
+		info = stat
+	}
+	reg := l.cachedRegistry(info)
+	if reg == nil {
+		loaded, err := loadRegistry(l.root)
+		if err != nil {
+			return fmt.Errorf("strategy loader: load registry: %w", err)
+		}
+		reg = loaded
 	}
 	if reg == nil {
 		reg = make(registry)
 	}
-	return l.refreshFromRegistry(ctx, reg)
+	return l.refreshFromRegistry(ctx, reg, info)
 }
 
-func (l *Loader) refreshFromRegistry(ctx context.Context, reg registry) error {
-	nextFiles := make(map[string]*Module)
-	nextByName := make(map[string]*Module)
-	nextByHash := make(map[string]*Module)
-	modulesByName := make(map[string]map[string]*Module)
-	tagsByName := make(map[string]map[string]string)
+// cachedRegistry returns the manifest decoded by the previous refresh when
+// registry.json is still the same file with the same size and modification
+// time. Registry writes replace the file via rename, so any write through the
+// loader changes its identity. The returned registry must not be mutated.
+func (l *Loader) cachedRegistry(info fs.FileInfo) registry {
+	if info == nil {
+		return nil
+	}
+	l.mu.RLock()
+	defer l.mu.RUnlock()
+	prev := l.registryInfo
+	if l.registry == nil || prev == nil {
+		return nil
+	}
+	if !os.SameFile(prev, info) || prev.Size() != info.Size() || !prev.ModTime().Equal(info.ModTime()) {
+		return nil
+	}
+	return l.registry
+}
+
+// registeredRevision is a registry hash entry scheduled for loading during refresh.
+type registeredRevision struct {
+	rawName  string
+	name     string
+	hash     string
+	path     string
+	tag      string
+	compiled *Module
+	stamp    moduleFileStamp
+}
 
+// moduleFileStamp ties a module file's stat fields to the content hash read at
+// that point, letting refresh skip re-reading files that have not been rewritten.
+type moduleFileStamp struct {
+	modTime time.Time
+	size    int64
+	hash    string
+}
+
+func (s moduleFileStamp) matches(info fs.FileInfo) bool {
+	return s.hash != "" && s.size == info.Size() && s.modTime.Equal(info.ModTime())
+}
+
+func (l *Loader) refreshFromRegistry(ctx context.Context, reg registry, info fs.FileInfo) error {
+	revisions := make([]registeredRevision, 0, len(reg))
 	for rawName, entry := range reg {
 		select {
 		case <-ctx.Done():
-			if err := ctx.Err(); err != nil {
-				return fmt.Errorf("strategy loader: refresh canceled: %w", err)
-			}
-			return fmt.Errorf("strategy loader: refresh canceled")
+			return refreshCanceled(ctx)
 		default:
 		}
 
@@ -229,7 +286,6 @@ func (l *Loader) refreshFromRegistry(ctx context.Context, reg registry) error {
 		if name == "" {
 			return fmt.Errorf("strategy loader: registry contains empty strategy name")
 		}
-		hashToModule := make(map[string]*Module)
 		for hash, loc := range entry.Hashes {
 			normalizedHash := strings.TrimSpace(hash)
 			if normalizedHash == "" {
@@ -238,63 +294,171 @@ func (l *Loader) refreshFromRegistry(ctx context.Context, reg registry) error {
 			if err := validateRegistryLocation(name, normalizedHash, loc.Path); err != nil {
 				return err
 			}
-			modulePath := filepath.Join(l.root, filepath.Clean(loc.Path))
-			module, err := loadModule(modulePath)
-			if err != nil {
-				return fmt.Errorf("strategy loader: load module %q: %w", modulePath, err)
-			}
-			if module.Name == "" {
-				module.Name = name
-				module.Metadata.Name = name
-			}
-			if !strings.EqualFold(module.Name, name) {
-				return fmt.Errorf("strategy loader: module name %q does not match registry entry %q", module.Name, rawName)
+			revisions = append(revisions, registeredRevision{
+				rawName:  rawName,
+				name:     name,
+				hash:     normalizedHash,
+				path:     filepath.Join(l.root, filepath.Clean(loc.Path)),
+				tag:      loc.Tag,
+				compiled: nil,
+				stamp:    moduleFileStamp{modTime: time.Time{}, size: 0, hash: ""},
+			})
+		}
+	}
+
+	// Revisions compile independently, so load them on a bounded worker pool;
+	// each worker only writes its own slice element.
+	workers := concpool.New().
+		WithMaxGoroutines(runtime.GOMAXPROCS(0)).
+		WithContext(ctx).
+		WithCancelOnError().
+		WithFirstError()
+	for idx := range revisions {
+		rev := &revisions[idx]
+		workers.Go(func(ctx context.Context) error {
+			if err := ctx.Err(); err != nil {
+				return fmt.Errorf("refresh canceled: %w", err)
 			}
-			if module.Hash != normalizedHash {
-				return fmt.Errorf("strategy loader: module hash mismatch for %s (%s != %s)", modulePath, module.Hash, normalizedHash)
+			compiled, stamp, err := l.loadRegisteredModule(rev.path)
+			if err != nil {
+				return fmt.Errorf("load module %q: %w", rev.path, err)
 			}
-			module.Tags = collectTagsForHash(entry.Tags, loc.Tag, normalizedHash)
-			module.Metadata.Tag = loc.Tag
-			module.Tag = loc.Tag
-			hashToModule[normalizedHash] = module
-			nextFiles[module.Path] = module
-			nextByHash[normalizedHash] = module
+			rev.compiled = compiled
+			rev.stamp = stamp
+			return nil
+		})
+	}
+	if err := workers.Wait(); err != nil {
+		return fmt.Errorf("strategy loader: %w", err)
+	}
+
+	nextFiles := make(map[string]*Module, len(revisions))
+	nextByName := make(map[string]*Module, len(reg))
+	nextByHash := make(map[string]*Module, len(revisions))
+	modulesByName := make(map[string]map[string]*Module, len(reg))
+	tagsByName := make(map[string]map[string]string, len(reg))
+	rawNames := make(map[string]string, len(reg))
+	nextCompiled := make(map[string]*Module, len(revisions))
+	nextStamps := make(map[string]moduleFileStamp, len(revisions))
+
+	for _, rev := range revisions {
+		entry := reg[rev.rawName]
+		nextCompiled[rev.compiled.Hash] = rev.compiled
+		nextStamps[rev.path] = rev.stamp
+		module := rev.compiled.clone()
+		module.Path = rev.path
+		module.Filename = filepath.Base(rev.path)
+		if module.Name == "" {
+			module.Name = rev.name
+			module.Metadata.Name = rev.name
 		}
-		if len(hashToModule) == 0 {
-			continue
+		if !strings.EqualFold(module.Name, rev.name) {
+			return fmt.Errorf("strategy loader: module name %q does not match registry entry %q", module.Name, rev.rawName)
+		}
+		if module.Hash != rev.hash {
+			return fmt.Errorf("strategy loader: module hash mismatch for %s (%s != %s)", rev.path, module.Hash, rev.hash)
+		}
+		module.Tags = collectTagsForHash(entry.Tags, rev.tag, rev.hash)
+		module.Metadata.Tag = rev.tag
+		module.Tag = rev.tag
+		hashToModule, ok := modulesByName[rev.name]
+		if !ok {
+			hashToModule = make(map[string]*Module)
+			modulesByName[rev.name] = hashToModule
+			tagsByName[rev.name] = cloneStringMap(entry.Tags)
+			rawNames[rev.name] = rev.rawName
 		}
-		modulesByName[name] = hashToModule
-		tagsByName[name] = cloneStringMap(entry.Tags)
+		hashToModule[rev.hash] = module
+		nextFiles[module.Path] = module
+		nextByHash[rev.hash] = module
+	}
 
-		defaultHash := strings.TrimSpace(entry.Tags["latest"])
+	for name, hashToModule := range modulesByName {
+		defaultHash := strings.TrimSpace(tagsByName[name]["latest"])
 		if defaultHash == "" {
-			// If latest is not specified, take the first hash in deterministic order.
-			hashes := make([]string, 0, len(hashToModule))
+			// If latest is not specified, take the lowest hash for a deterministic default.
 			for h := range hashToModule {
-				hashes = append(hashes, h)
+				if defaultHash == "" || h < defaultHash {
+					defaultHash = h
+				}
 			}
-			sort.Strings(hashes)
-			defaultHash = hashes[0]
 		}
 		defaultModule, ok := hashToModule[defaultHash]
 		if !ok {
-			return fmt.Errorf("strategy loader: latest hash %q not found for %s", defaultHash, rawName)
+			return fmt.Errorf("strategy loader: latest hash %q not found for %s", defaultHash, rawNames[name])
 		}
 		nextByName[name] = defaultModule
 	}
 
 	l.mu.Lock()
 	l.registry = reg
+	l.registryInfo = info
 	l.files = nextFiles
 	l.byName = nextByName
 	l.byHash = nextByHash
 	l.modulesByName = modulesByName
 	l.tags = tagsByName
+	l.compiled = nextCompiled
+	l.fileStamps = nextStamps
 	l.clearResolutionCacheLocked()
 	l.mu.Unlock()
 	return nil
 }
 
+func refreshCanceled(ctx context.Context) error {
+	if err := ctx.Err(); err != nil {
+		return fmt.Errorf("strategy loader: refresh canceled: %w", err)
+	}
+	return fmt.Errorf("strategy loader: refresh canceled")
+}
+
+// loadRegisteredModule returns the compiled module stored at path. Files whose
+// size and modification time match the previous refresh are served without
+// being read; otherwise programs compiled by an earlier refresh are
+// reused when the content hash is unchanged, so only new revisions pay for
+// compilation and metadata evaluation. The returned module is shared and must
+// be cloned before mutation.
+func (l *Loader) loadRegisteredModule(path string) (*Module, moduleFileStamp, error) {
+	var stamp moduleFileStamp
+	info, err := os.Stat(path)
+	if err != nil {
+		return nil, stamp, fmt.Errorf("strategy loader: stat %q: %w", path, err)
+	}
+	if module, cached := l.stampedModule(path, info); module != nil {
+		return module, cached, nil
+	}
+	// #nosec G304
+	source, err := os.ReadFile(path)
+	if err != nil {
+		return nil, stamp, fmt.Errorf("strategy loader: read %q: %w", path, err)
+	}
+	stamp = moduleFileStamp{modTime: info.ModTime(), size: info.Size(), hash: moduleHash(source)}
+	if module := l.compiledModule(stamp.hash); module != nil {
+		return module, stamp, nil
+	}
+	module, err := compileSource(path, source, int64(len(source)))
+	if err != nil {
+		return nil, stamp, err
+	}
+	return module, stamp, nil
+}
+
+func (l *Loader) stampedModule(path string, info fs.FileInfo) (*Module, moduleFileStamp) {
+	l.mu.RLock()
+	defer l.mu.RUnlock()
+	stamp, ok := l.fileStamps[path]
+	if !ok || !stamp.matches(info) {
+		return nil, stamp
+	}
+	return l.compiled[stamp.hash], stamp
+}
+
+func (l *Loader) compiledModule(hash string) *Module {
+	l.mu.RLock()
+	defer l.mu.RUnlock()
+	return l.compiled[hash]
+}
+
 // List returns the loaded module catalog without usage annotations.
 func (l *Loader) List() []ModuleSummary {
 	return l.ListWithUsage(nil)
@@ -309,45 +473,7 @@ func (l *Loader) ListWithUsage(usages []ModuleUsageSnapshot) []ModuleSummary {
 
 	out := make([]ModuleSummary, 0, len(l.byName))
 	for name, module := range l.byName {
-		summary := module.toSummary(name)
-		if aliases, ok := l.tags[name]; ok {
-			summary.TagAliases = cloneStringMap(aliases)
-		}
-		if revisions, ok := l.modulesByName[name]; ok {
-			list := make([]ModuleRevision, 0, len(revisions))
-			for hash, revModule := range revisions {
-				revision := ModuleRevision{
-					Hash:    hash,
-					Alias:   primaryTagForHash(l.tags[name], hash),
-					Path:    revModule.Path,
-					Tag:     revModule.Tag,
-					Size:    revModule.Size,
-					Retired: false,
-				}
-				if usage, ok := usageIndex.lookup(name, hash); ok {
-					inactive := usage.Count == 0
-					if inactive && hashHasActiveAlias(l.tags[name], hash) {
-						inactive = false
-					}
-					revision.Retired = inactive
-				}
-				list = append(list, revision)
-			}
-			sort.Slice(list, func(i, j int) bool {
-				if list[i].Tag != "" && list[j].Tag != "" && list[i].Tag != list[j].Tag {
-					return list[i].Tag < list[j].Tag
-				}
-				if list[i].Alias != "" && list[j].Alias != "" && list[i].Alias != list[j].Alias {
-					return list[i].Alias < list[j].Alias
-				}
-				return list[i].Hash < list[j].Hash
-			})
-			summary.Revisions = list
-		}
-		if running := buildModuleRunningUsage(usageIndex.forName(name)); len(running) > 0 {
-			summary.Running = running
-		}
-		out = append(out, summary)
+		out = append(out, l.summarizeLocked(name, module, usageIndex))
 	}
 	sort.Slice(out, func(i, j int) bool {
 		return out[i].Name < out[j].Name
@@ -374,45 +500,57 @@ func (l *Loader) ModuleWithUsage(name string, usages []ModuleUsageSnapshot) (Mod
 	l.mu.RLock()
 	defer l.mu.RUnlock()
 
-	summary := module.toSummary(normalized)
-	if aliases, ok := l.tags[normalized]; ok {
-		summary.TagAliases = cloneStringMap(aliases)
+	return l.summarizeLocked(normalized, module, usageIndex), nil
+}
+
+// summarizeLocked builds the catalog summary for a strategy, including its
+// tag aliases, revisions and running usage. name must be the normalized
+// strategy name, as stored in the loader maps. Callers must hold l.mu.
+func (l *Loader) summarizeLocked(name string, module *Module, usageIndex moduleUsageIndex) ModuleSummary {
+	summary := module.toSummary(name)
+	tags := l.tags[name]
+	if tags != nil {
+		summary.TagAliases = cloneStringMap(tags)
 	}
-	if revisions, ok := l.modulesByName[normalized]; ok {
+	if revisions, ok := l.modulesByName[name]; ok {
 		list := make([]ModuleRevision, 0, len(revisions))
 		for hash, revModule := range revisions {
 			revision := ModuleRevision{
 				Hash:    hash,
-				Alias:   primaryTagForHash(l.tags[normalized], hash),
+				Alias:   primaryTagForHash(tags, hash),
 				Path:    revModule.Path,
 				Tag:     revModule.Tag,
 				Size:    revModule.Size,
 				Retired: false,
 			}
-			if usage, ok := usageIndex.lookup(normalized, hash); ok {
+			if usage, ok := usageIndex.lookup(name, hash); ok {
 				inactive := usage.Count == 0
-				if inactive && hashHasActiveAlias(l.tags[normalized], hash) {
+				if inactive && hashHasActiveAlias(tags, hash) {
 					inactive = false
 				}
 				revision.Retired = inactive
 			}
 			list = append(list, revision)
 		}
-		sort.Slice(list, func(i, j int) bool {
-			if list[i].Tag != "" && list[j].Tag != "" && list[i].Tag != list[j].Tag {
-				return list[i].Tag < list[j].Tag
-			}
-			if list[i].Alias != "" && list[j].Alias != "" && list[i].Alias != list[j].Alias {
-				return list[i].Alias < list[j].Alias
-			}
-			return list[i].Hash < list[j].Hash
-		})
+		slices.SortFunc(list, compareModuleRevisions)
 		summary.Revisions = list
 	}
-	if running := buildModuleRunningUsage(usageIndex.forName(normalized)); len(running) > 0 {
+	if running := usageIndex.runningUsage(name); len(running) > 0 {
 		summary.Running = running
 	}
-	return summary, nil
+	return summary
+}
+
+// compareModuleRevisions orders revisions by tag, then alias, then hash, only
+// comparing tags and aliases when both sides carry one.
+func compareModuleRevisions(a, b ModuleRevision) int {
+	if a.Tag != "" && b.Tag != "" && a.Tag != b.Tag {
+		return strings.Compare(a.Tag, b.Tag)
+	}
+	if a.Alias != "" && b.Alias != "" && a.Alias != b.Alias {
+		return strings.Compare(a.Alias, b.Alias)
+	}
+	return strings.Compare(a.Hash, b.Hash)
 }
 
 // RegistrySnapshot returns the on-disk registry manifest.
@@ -603,18 +741,19 @@ func (l *Loader) Get(name string) (*Module, error) {
 	return nil, ErrModuleNotFound
 }
 
-// Read returns the raw JavaScript source for the named strategy.
-func (l *Loader) Read(name string) ([]byte, error) {
+// Open returns a reader over the raw JavaScript source for the named strategy so
+// callers can stream it without buffering the whole file. Callers must close it.
+func (l *Loader) Open(name string) (io.ReadCloser, error) {
 	module, err := l.Get(name)
-	if err == nil {
-		// #nosec G304
-		source, readErr := os.ReadFile(module.Path)
-		if readErr != nil {
-			return nil, fmt.Errorf("strategy loader: read %q: %w", module.Path, readErr)
-		}
-		return source, nil
+	if err != nil {
+		return nil, err
+	}
+	// #nosec G304
+	file, err := os.Open(module.Path)
+	if err != nil {
+		return nil, fmt.Errorf("strategy loader: read %q: %w", module.Path, err)
 	}
-	return nil, err
+	return file, nil
 }
 
 // Delete removes the JavaScript source for the named strategy.
@@ -770,7 +909,7 @@ func (l *Loader) deleteTag(name, tag string, opts TagDeleteOptions) (string, err
 func loadRegistry(root string) (registry, error) {
 	path := filepath.Join(root, "registry.json")
 	// #nosec G304 -- path is derived from controlled loader root and fixed filename
-	data, err := os.ReadFile(path)
+	file, err := os.Open(path)
 	if err != nil {
 		if errors.Is(err, fs.ErrNotExist) {
 			empty := make(registry)
@@ -781,13 +920,21 @@ func loadRegistry(root string) (registry, error) {
 		}
 		return nil, fmt.Errorf("strategy loader: read registry %q: %w", path, err)
 	}
+	defer func() { _ = file.Close() }()
+
+	// Decode from the file stream instead of reading the manifest into a
+	// separate buffer that Unmarshal would copy again.
 	var reg registry
-	if len(bytes.TrimSpace(data)) == 0 {
-		return make(registry), nil
-	}
-	if err := json.Unmarshal(data, &reg); err != nil {
+	decoder := json.NewDecoder(file)
+	if err := decoder.Decode(&reg); err != nil {
+		if errors.Is(err, io.EOF) {
+			return make(registry), nil
+		}
 		return nil, fmt.Errorf("strategy loader: decode registry %q: %w", path, err)
 	}
+	if _, err := decoder.Token(); !errors.Is(err, io.EOF) {
+		return nil, fmt.Errorf("strategy loader: decode registry %q: unexpected trailing data", path)
+	}
 	if reg == nil {
 		return make(registry), nil
 	}
@@ -860,12 +1007,11 @@ func cloneStringMap(src map[string]string) map[string]string {
 	return dst
 }
 
-func loadModule(path string) (*Module, error) {
-	info, err := os.Stat(path)
-	if err != nil {
-		return nil, fmt.Errorf("strategy loader: stat %q: %w", path, err)
-	}
-	return compileModule(path, info)
+func (m *Module) clone() *Module {
+	clone := *m
+	clone.Tags = append([]string(nil), m.Tags...)
+	clone.Metadata = strategies.CloneMetadata(m.Metadata)
+	return &clone
 }
 
 func (m *Module) toSummary(name string) ModuleSummary {
@@ -911,12 +1057,7 @@ func cloneTagsWithFallback(src []string, fallback string) []string {
 	return out
 }
 
-func compileModule(fullPath string, info fs.FileInfo) (*Module, error) {
-	// #nosec G304
-	source, err := os.ReadFile(fullPath)
-	if err != nil {
-		return nil, fmt.Errorf("strategy loader: read %q: %w", fullPath, err)
-	}
+func compileSource(fullPath string, source []byte, size int64) (*Module, error) {
 	program, err := goja.Compile(fullPath, string(source), true)
 	if err != nil {
 		diagErr := NewDiagnosticError(
@@ -931,19 +1072,16 @@ func compileModule(fullPath string, info fs.FileInfo) (*Module, error) {
 	if err != nil {
 		return nil, fmt.Errorf("strategy loader: %s: %w", fullPath, err)
 	}
-	sum := sha256.Sum256(source)
-	hash := hex.EncodeToString(sum[:])
-
 	module := &Module{
 		Name:     strings.ToLower(strings.TrimSpace(meta.Name)),
 		Filename: filepath.Base(fullPath),
 		Path:     fullPath,
-		Hash:     fmt.Sprintf("sha256:%s", hash),
+		Hash:     moduleHash(source),
 		Tag:      "",
 		Tags:     nil,
 		Metadata: meta,
 		Program:  program,
-		Size:     info.Size(),
+		Size:     size,
 	}
 	module.Metadata.Name = module.Name
 	if module.Metadata.Tag != "" {
@@ -952,6 +1090,21 @@ func compileModule(fullPath string, info fs.FileInfo) (*Module, error) {
 	return module, nil
 }
 
+const moduleHashPrefix = "sha256:"
+
+// moduleHash returns the registry hash for source, encoding the digest on the
+// stack so the returned string is the only allocation.
+func moduleHash(source []byte) string {
+	sum := sha256.Sum256(source)
+	var digest [sha256.Size * 2]byte
+	hex.Encode(digest[:], sum[:])
+	var out strings.Builder
+	out.Grow(len(moduleHashPrefix) + len(digest))
+	out.WriteString(moduleHashPrefix)
+	out.Write(digest[:])
+	return out.String()
+}
+
 func extractMetadata(program *goja.Program) (strategies.Metadata, error) {
 	rt := goja.New()
 	rt.SetFieldNameMapper(goja.TagFieldNameMapper("json", true))
@@ -1089,40 +1242,18 @@ func (l *Loader) writeModuleWithRegistry(source []byte, opts ModuleWriteOptions,
 		reg = make(registry)
 	}
 
-	tempFile, err := os.CreateTemp(l.root, "strategy-*.js")
+	// Validate the upload entirely in memory; the revision file is only
+	// written once the registry does not already hold this content.
+	module, err := compileSource(filepath.Join(l.root, uploadSourceName), source, int64(len(source)))
 	if err != nil {
-		return empty, fmt.Errorf("strategy loader: create temp file: %w", err)
-	}
-	tempPath := tempFile.Name()
-	if _, err := tempFile.Write(source); err != nil {
-		_ = tempFile.Close()
-		_ = os.Remove(tempPath)
-		return empty, fmt.Errorf("strategy loader: write temp file: %w", err)
-	}
-	if err := tempFile.Close(); err != nil {
-		_ = os.Remove(tempPath)
-		return empty, fmt.Errorf("strategy loader: close temp file: %w", err)
-	}
-
-	info, err := os.Stat(tempPath)
-	if err != nil {
-		_ = os.Remove(tempPath)
-		return empty, fmt.Errorf("strategy loader: stat temp file: %w", err)
-	}
-
-	module, err := compileModule(tempPath, info)
-	if err != nil {
-		_ = os.Remove(tempPath)
 		return empty, err
 	}
 
 	name := strings.ToLower(strings.TrimSpace(module.Metadata.Name))
 	if name == "" {
-		_ = os.Remove(tempPath)
 		return empty, fmt.Errorf("strategy loader: metadata name required")
 	}
 	if err := validatePathSegment(name); err != nil {
-		_ = os.Remove(tempPath)
 		return empty, fmt.Errorf("strategy loader: %w", err)
 	}
 
@@ -1131,17 +1262,14 @@ func (l *Loader) writeModuleWithRegistry(source []byte, opts ModuleWriteOptions,
 		tag = strings.TrimSpace(module.Metadata.Tag)
 	}
 	if tag == "" {
-		_ = os.Remove(tempPath)
 		return empty, fmt.Errorf("strategy loader: metadata tag required for registry writes")
 	}
 	if err := validatePathSegment(tag); err != nil {
-		_ = os.Remove(tempPath)
 		return empty, fmt.Errorf("strategy loader: %w", err)
 	}
 
 	hash := module.Hash
 	if hash == "" {
-		_ = os.Remove(tempPath)
 		return empty, fmt.Errorf("strategy loader: hash missing for module %s", name)
 	}
 
@@ -1153,15 +1281,10 @@ func (l *Loader) writeModuleWithRegistry(source []byte, opts ModuleWriteOptions,
 		entry.Hashes = make(map[string]registryLocation)
 	}
 
-	destPath, relPath, reused, err := l.persistRevisionFile(name, hash, tempPath, entry)
+	destPath, relPath, err := l.persistRevisionFile(name, hash, source, entry)
 	if err != nil {
-		_ = os.Remove(tempPath)
 		return empty, err
 	}
-	if reused {
-		// persistRevisionFile reused an existing revision file, so clean up the temp file.
-		_ = os.Remove(tempPath)
-	}
 
 	entry.Tags[tag] = hash
 	entry.Hashes[hash] = registryLocation{
@@ -1217,32 +1340,68 @@ func (l *Loader) writeModuleWithRegistry(source []byte, opts ModuleWriteOptions,
 	}, nil
 }
 
-func (l *Loader) persistRevisionFile(name, hash, tempPath string, entry registryEntry) (string, string, bool, error) {
+// persistRevisionFile stores source as the revision file for name@hash. An
+// existing file for the hash is reused untouched; otherwise the source is
+// written to a temp file inside the revision directory and renamed into place.
+func (l *Loader) persistRevisionFile(name, hash string, source []byte, entry registryEntry) (string, string, error) {
 	if loc, ok := entry.Hashes[hash]; ok {
 		fullPath := filepath.Join(l.root, filepath.Clean(loc.Path))
 		if info, err := os.Stat(fullPath); err == nil && !info.IsDir() {
-			return fullPath, filepath.ToSlash(filepath.Clean(loc.Path)), true, nil
+			return fullPath, filepath.ToSlash(filepath.Clean(loc.Path)), nil
 		}
 	}
 
 	digest, err := hashDirectoryComponent(hash)
 	if err != nil {
-		return "", "", false, err
+		return "", "", err
 	}
 	dir := filepath.Join(l.root, name, digest)
-	if err := os.MkdirAll(dir, 0o750); err != nil {
-		return "", "", false, fmt.Errorf("strategy loader: ensure directory %q: %w", dir, err)
+	if err := ensureRevisionDir(dir); err != nil {
+		return "", "", fmt.Errorf("strategy loader: ensure directory %q: %w", dir, err)
 	}
 	destPath := filepath.Join(dir, fmt.Sprintf("%s.js", name))
 
+	tempFile, err := os.CreateTemp(dir, "strategy-*.js")
+	if err != nil {
+		return "", "", fmt.Errorf("strategy loader: create temp file: %w", err)
+	}
+	tempPath := tempFile.Name()
+	if _, err := tempFile.Write(source); err != nil {
+		_ = tempFile.Close()
+		_ = os.Remove(tempPath)
+		return "", "", fmt.Errorf("strategy loader: write temp file: %w", err)
+	}
+	if err := tempFile.Close(); err != nil {
+		_ = os.Remove(tempPath)
+		return "", "", fmt.Errorf("strategy loader: close temp file: %w", err)
+	}
 	if err := os.Rename(tempPath, destPath); err != nil {
-		return "", "", false, fmt.Errorf("strategy loader: persist %q: %w", destPath, err)
+		_ = os.Remove(tempPath)
+		return "", "", fmt.Errorf("strategy loader: persist %q: %w", destPath, err)
 	}
 	relPath, err := filepath.Rel(l.root, destPath)
 	if err != nil {
-		return "", "", false, fmt.Errorf("strategy loader: relative path: %w", err)
+		return "", "", fmt.Errorf("strategy loader: relative path: %w", err)
+	}
+	return destPath, filepath.ToSlash(relPath), nil
+}
+
+// ensureRevisionDir creates a revision directory. Revision directories are
+// normally new while their strategy directory already exists, so a single
+// Mkdir is attempted before falling back to MkdirAll for first uploads.
+func ensureRevisionDir(dir string) error {
+	err := os.Mkdir(dir, 0o750)
+	switch {
+	case err == nil, errors.Is(err, fs.ErrExist):
+		return nil
+	case errors.Is(err, fs.ErrNotExist):
+		if err := os.MkdirAll(dir, 0o750); err != nil {
+			return fmt.Errorf("mkdir: %w", err)
+		}
+		return nil
+	default:
+		return fmt.Errorf("mkdir: %w", err)
 	}
-	return destPath, filepath.ToSlash(relPath), false, nil
 }
 
 func hashDirectoryComponent(hash string) (string, error) {
@@ -1272,8 +1431,8 @@ func validateRegistryLocation(name, hash, relPath string) error {
 		return fmt.Errorf("strategy loader: registry path missing for %s@%s", name, hash)
 	}
 	normalized := filepath.ToSlash(filepath.Clean(relPath))
-	expected := filepath.ToSlash(filepath.Join(name, digest, fmt.Sprintf("%s.js", name)))
-	if normalized != expected {
+	if !isRevisionPath(normalized, name, digest) {
+		expected := filepath.ToSlash(filepath.Join(name, digest, fmt.Sprintf("%s.js", name)))
 		return fmt.Errorf(
 			"strategy loader: registry path mismatch for %s@%s (expected %s, got %s)",
 			name,
@@ -1285,6 +1444,28 @@ func validateRegistryLocation(name, hash, relPath string) error {
 	return nil
 }
 
+// isRevisionPath reports whether rel is exactly <name>/<digest>/<name>.js,
+// matching segment by segment so the expected path is only built for errors.
+func isRevisionPath(rel, name, digest string) bool {
+	rest, ok := strings.CutPrefix(rel, name)
+	if !ok {
+		return false
+	}
+	if rest, ok = strings.CutPrefix(rest, "/"); !ok {
+		return false
+	}
+	if rest, ok = strings.CutPrefix(rest, digest); !ok {
+		return false
+	}
+	if rest, ok = strings.CutPrefix(rest, "/"); !ok {
+		return false
+	}
+	if rest, ok = strings.CutPrefix(rest, name); !ok {
+		return false
+	}
+	return rest == ".js"
+}
+
 func (l *Loader) applyRegistryTagUpdate(name string, entry registryEntry) {
 	if l == nil {
 		return
@@ -1333,12 +1514,23 @@ func countTagReferences(tags map[string]string, skipTag, hash string) int {
 
 func writeRegistryFile(root string, reg registry) error {
 	path := filepath.Join(root, "registry.json")
-	data, err := json.MarshalIndent(reg, "", "  ")
+	tmp := path + ".tmp"
+	// #nosec G304 -- path is derived from controlled loader root and fixed filename
+	file, err := os.OpenFile(tmp, os.O_WRONLY|os.O_CREATE|os.O_TRUNC, 0o600)
 	if err != nil {
+		return fmt.Errorf("strategy loader: write registry: %w", err)
+	}
+	// Encode straight into the file so the manifest is not materialized as a
+	// separate byte slice before writing.
+	encoder := json.NewEncoder(file)
+	encoder.SetIndent("", "  ")
+	if err := encoder.Encode(reg); err != nil {
+		_ = file.Close()
+		_ = os.Remove(tmp)
 		return fmt.Errorf("strategy loader: marshal registry: %w", err)
 	}
-	tmp := path + ".tmp"
-	if err := os.WriteFile(tmp, data, 0o600); err != nil {
+	if err := file.Close(); err != nil {
+		_ = os.Remove(tmp)
 		return fmt.Errorf("strategy loader: write registry: %w", err)
 	}
 	if err := os.Rename(tmp, path); err != nil {
@@ -1439,13 +1631,25 @@ func (l *Loader) removeModuleFiles(loc registryLocation) error {
 		return fmt.Errorf("strategy loader: delete module %q: %w", fullPath, err)
 	}
 	dir := filepath.Dir(fullPath)
-	entries, err := os.ReadDir(dir)
-	if err == nil && len(entries) == 0 {
+	if isEmptyDir(dir) {
 		_ = os.Remove(dir)
 	}
 	return nil
 }
 
+// isEmptyDir reports whether dir has no entries, reading at most one name
+// instead of listing and sorting the whole directory.
+func isEmptyDir(dir string) bool {
+	// #nosec G304 -- dir is derived from a validated registry path under the loader root
+	handle, err := os.Open(dir)
+	if err != nil {
+		return false
+	}
+	defer func() { _ = handle.Close() }()
+	_, err = handle.Readdirnames(1)
+	return errors.Is(err, io.EOF)
+}
+
 type moduleSelector struct {
 	Name string
 	Tag  string
@@ -1482,21 +1686,21 @@ func parseModuleSelector(selector string) (moduleSelector, error) {
 }
 
 func pickReplacementLatest(tags map[string]string) string {
-	if len(tags) == 0 {
-		return ""
-	}
-	candidates := make([]string, 0, len(tags))
+	first := ""
+	found := false
 	for tag := range tags {
 		if tag == "latest" {
 			continue
 		}
-		candidates = append(candidates, tag)
+		if !found || tag < first {
+			first = tag
+			found = true
+		}
 	}
-	if len(candidates) == 0 {
+	if !found {
 		return ""
 	}
-	sort.Strings(candidates)
-	return tags[candidates[0]]
+	return tags[first]
 }
 
 func (l *Loader) resolveTagLocked(name, tag string) (*Module, string, error) {
@@ -1525,70 +1729,72 @@ func (l *Loader) resolveTagLocked(name, tag string) (*Module, string, error) {
 	return nil, "", fmt.Errorf("strategy loader: tag %q not found for %s", tag, name)
 }
 
-type moduleUsageIndex map[string]map[string]ModuleUsageSnapshot
+// moduleUsageKey identifies a strategy revision in the usage index.
+type moduleUsageKey struct {
+	name string
+	hash string
+}
+
+// moduleUsageIndex keys usage snapshots by (name, hash) so revision lookups
+// are a single map probe; hashesByName lists each strategy's indexed hashes
+// for running-usage summaries.
+type moduleUsageIndex struct {
+	revisions    map[moduleUsageKey]ModuleUsageSnapshot
+	hashesByName map[string][]string
+}
 
 func indexModuleUsage(usages []ModuleUsageSnapshot) moduleUsageIndex {
+	index := moduleUsageIndex{revisions: nil, hashesByName: nil}
 	if len(usages) == 0 {
-		return nil
+		return index
 	}
-	index := make(moduleUsageIndex)
+	index.revisions = make(map[moduleUsageKey]ModuleUsageSnapshot, len(usages))
+	index.hashesByName = make(map[string][]string)
 	for _, snapshot := range usages {
 		name := strings.ToLower(strings.TrimSpace(snapshot.Name))
 		hash := normalizeHash(snapshot.Hash)
 		if name == "" || hash == "" {
 			continue
 		}
-		if _, ok := index[name]; !ok {
-			index[name] = make(map[string]ModuleUsageSnapshot)
+		key := moduleUsageKey{name: name, hash: hash}
+		if _, ok := index.revisions[key]; !ok {
+			index.hashesByName[name] = append(index.hashesByName[name], hash)
 		}
 		copySnapshot := snapshot
 		copySnapshot.Name = name
 		copySnapshot.Hash = hash
 		sort.Strings(copySnapshot.Instances)
-		index[name][hash] = copySnapshot
+		index.revisions[key] = copySnapshot
 	}
 	return index
 }
 
+// lookup returns the usage snapshot for a revision. name must already be
+// normalized; the index never stores empty names or hashes, so those miss.
 func (idx moduleUsageIndex) lookup(name, hash string) (ModuleUsageSnapshot, bool) {
-	if len(idx) == 0 {
+	if len(idx.revisions) == 0 {
 		var empty ModuleUsageSnapshot
 		return empty, false
 	}
-	normalizedName := strings.ToLower(strings.TrimSpace(name))
-	normalizedHash := normalizeHash(hash)
-	if normalizedName == "" || normalizedHash == "" {
-		var empty ModuleUsageSnapshot
-		return empty, false
-	}
-	if revisions, ok := idx[normalizedName]; ok {
-		if snapshot, ok := revisions[normalizedHash]; ok {
-			return snapshot, true
-		}
-	}
-	var empty ModuleUsageSnapshot
-	return empty, false
-}
-
-func (idx moduleUsageIndex) forName(name string) map[string]ModuleUsageSnapshot {
-	if len(idx) == 0 {
-		return nil
-	}
-	normalizedName := strings.ToLower(strings.TrimSpace(name))
-	return idx[normalizedName]
+	snapshot, ok := idx.revisions[moduleUsageKey{name: name, hash: normalizeHash(hash)}]
+	return snapshot, ok
 }
 
-func buildModuleRunningUsage(entries map[string]ModuleUsageSnapshot) []ModuleUsage {
-	if len(entries) == 0 {
+// runningUsage returns the revisions of the normalized name with live
+// instances, busiest first.
+func (idx moduleUsageIndex) runningUsage(name string) []ModuleUsage {
+	hashes := idx.hashesByName[name]
+	if len(hashes) == 0 {
 		return nil
 	}
-	out := make([]ModuleUsage, 0, len(entries))
-	for hash, snapshot := range entries {
+	out := make([]ModuleUsage, 0, len(hashes))
+	for _, hash := range hashes {
+		snapshot := idx.revisions[moduleUsageKey{name: name, hash: hash}]
 		if snapshot.Count <= 0 {
 			continue
 		}
 		usage := ModuleUsage{
-			Hash:      hash,
+			Hash:      snapshot.Hash,
 			Instances: append([]string(nil), snapshot.Instances...),
 			Count:     snapshot.Count,
 			FirstSeen: snapshot.FirstSeen,
@@ -1599,11 +1805,11 @@ func buildModuleRunningUsage(entries map[string]ModuleUsageSnapshot) []ModuleUsa
 	if len(out) == 0 {
 		return nil
 	}
-	sort.Slice(out, func(i, j int) bool {
-		if out[i].Count != out[j].Count {
-			return out[i].Count > out[j].Count
+	slices.SortFunc(out, func(a, b ModuleUsage) int {
+		if a.Count != b.Count {
+			return cmp.Compare(b.Count, a.Count)
 		}
-		return out[i].Hash < out[j].Hash
+		return strings.Compare(a.Hash, b.Hash)
 	})
 	return out
 }
@@ -140,6 +140,126 @@ func TestLoaderRefreshOverridesMetadataTag(t *testing.T) {
 	}
 }
 
+func TestLoaderRefreshReusesCompiledPrograms(t *testing.T) {
+	dir := t.TempDir()
+	if err := os.WriteFile(filepath.Join(dir, "registry.json"), []byte("{}"), 0o600); err != nil {
+		t.Fatalf("write registry: %v", err)
+	}
+
+	loader, err := NewLoader(dir)
+	if err != nil {
+		t.Fatalf("NewLoader: %v", err)
+	}
+	resolution, err := loader.Store([]byte(sampleModule), ModuleWriteOptions{Tag: "v1.0.0", PromoteLatest: true})
+	if err != nil {
+		t.Fatalf("Store: %v", err)
+	}
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("Refresh: %v", err)
+	}
+	first, err := loader.Get("noop")
+	if err != nil {
+		t.Fatalf("Get: %v", err)
+	}
+	if first.Program == resolution.Module.Program {
+		t.Fatalf("expected refresh to compile the stored revision from its registry path")
+	}
+	if first.Tag != "v1.0.0" || first.Filename != "noop.js" {
+		t.Fatalf("unexpected module identity after refresh: tag=%s file=%s", first.Tag, first.Filename)
+	}
+
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("second Refresh: %v", err)
+	}
+	second, err := loader.Get("noop")
+	if err != nil {
+		t.Fatalf("Get: %v", err)
+	}
+	if second == first {
+		t.Fatalf("expected refresh to publish a fresh module value")
+	}
+	if second.Program != first.Program {
+		t.Fatalf("expected unchanged revision to reuse compiled program")
+	}
+}
+
+func TestLoaderRefreshDetectsRewrittenModule(t *testing.T) {
+	dir := t.TempDir()
+	modulePath := writeVersionedModule(t, dir, "noop", "v1.0.0", []byte(sampleModule))
+	writeRegistry(t, dir, "noop", "v1.0.0", modulePath)
+
+	loader, err := NewLoader(dir)
+	if err != nil {
+		t.Fatalf("NewLoader: %v", err)
+	}
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("Refresh: %v", err)
+	}
+
+	tampered := strings.Replace(sampleModule, "No operation strategy", "Tampered strategy", 1)
+	if err := os.WriteFile(modulePath, []byte(tampered), 0o600); err != nil {
+		t.Fatalf("rewrite module: %v", err)
+	}
+	future := time.Now().Add(time.Minute)
+	if err := os.Chtimes(modulePath, future, future); err != nil {
+		t.Fatalf("chtimes: %v", err)
+	}
+	err = loader.Refresh(context.Background())
+	if err == nil || !strings.Contains(err.Error(), "hash mismatch") {
+		t.Fatalf("expected hash mismatch after rewrite, got %v", err)
+	}
+}
+
+func TestLoaderRefreshReloadsRewrittenRegistry(t *testing.T) {
+	dir := t.TempDir()
+	modulePath := writeVersionedModule(t, dir, "noop", "v1.0.0", []byte(sampleModule))
+	writeRegistry(t, dir, "noop", "v1.0.0", modulePath)
+
+	loader, err := NewLoader(dir)
+	if err != nil {
+		t.Fatalf("NewLoader: %v", err)
+	}
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("Refresh: %v", err)
+	}
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("cached Refresh: %v", err)
+	}
+	if modules := loader.List(); len(modules) != 1 {
+		t.Fatalf("expected 1 module from cached registry, got %d", len(modules))
+	}
+
+	alpha := strings.Replace(sampleModule, `name: "noop"`, `name: "alpha"`, 1)
+	if _, err := loader.Store([]byte(alpha), ModuleWriteOptions{PromoteLatest: true}); err != nil {
+		t.Fatalf("Store: %v", err)
+	}
+	if err := loader.Refresh(context.Background()); err != nil {
+		t.Fatalf("Refresh after store: %v", err)
+	}
+	if modules := loader.List(); len(modules) != 2 {
+		t.Fatalf("expected rewritten registry to be reloaded, got %d modules", len(modules))
+	}
+}
+
+func TestLoaderRefreshHonorsCanceledContext(t *testing.T) {
+	dir := t.TempDir()
+	modulePath := writeVersionedModule(t, dir, "noop", "v1.0.0", []byte(sampleModule))
+	writeRegistry(t, dir, "noop", "v1.0.0", modulePath)
+
+	loader, err := NewLoader(dir)
+	if err != nil {
+		t.Fatalf("NewLoader: %v", err)
+	}
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+	if err := loader.Refresh(ctx); !errors.Is(err, context.Canceled) {
+		t.Fatalf("expected context.Canceled, got %v", err)
+	}
+	if modules := loader.List(); len(modules) != 0 {
+		t.Fatalf("expected canceled refresh to leave catalog empty, got %d modules", len(modules))
+	}
+}
+
 func TestInstanceCall(t *testing.T) {
 	dir := t.TempDir()
 	modulePath := writeVersionedModule(t, dir, "noop", "v1.0.0", []byte(sampleModule))
@@ -220,7 +340,7 @@ func TestDeleteIgnoresUnregisteredFiles(t *testing.T) {
 	}
 }
 
-func TestCompileModuleSyntaxErrorProducesDiagnostic(t *testing.T) {
+func TestCompileSourceSyntaxErrorProducesDiagnostic(t *testing.T) {
 	dir := t.TempDir()
 	source := `
 module.exports = {
@@ -235,14 +355,7 @@ module.exports = {
   // missing closing braces
 `
 	path := filepath.Join(dir, "broken.js")
-	if err := os.WriteFile(path, []byte(source), 0o600); err != nil {
-		t.Fatalf("write module: %v", err)
-	}
-	info, err := os.Stat(path)
-	if err != nil {
-		t.Fatalf("stat module: %v", err)
-	}
-	if _, err := compileModule(path, info); err == nil {
+	if _, err := compileSource(path, []byte(source), int64(len(source))); err == nil {
 		t.Fatalf("expected compile error")
 	} else {
 		diagErr, ok := AsDiagnosticError(err)
@@ -266,7 +379,7 @@ module.exports = {
 	}
 }
 
-func TestCompileModuleMissingMetadataProducesDiagnostic(t *testing.T) {
+func TestCompileSourceMissingMetadataProducesDiagnostic(t *testing.T) {
 	dir := t.TempDir()
 	source := `
 module.exports = {
@@ -276,14 +389,7 @@ module.exports = {
 };
 `
 	path := filepath.Join(dir, "missing.js")
-	if err := os.WriteFile(path, []byte(source), 0o600); err != nil {
-		t.Fatalf("write module: %v", err)
-	}
-	info, err := os.Stat(path)
-	if err != nil {
-		t.Fatalf("stat module: %v", err)
-	}
-	if _, err := compileModule(path, info); err == nil {
+	if _, err := compileSource(path, []byte(source), int64(len(source))); err == nil {
 		t.Fatalf("expected metadata error when metadata export missing")
 	} else {
 		diagErr, ok := AsDiagnosticError(err)
@@ -299,7 +405,32 @@ module.exports = {
 	}
 }
 
-func TestCompileModuleMetadataValidationDiagnostics(t *testing.T) {
+func TestCompileSourceAcceptsComputedMetadataKey(t *testing.T) {
+	source := `
+var key = "meta" + "data";
+module.exports = {
+  create: function () {
+    return {};
+  }
+};
+module.exports[key] = {
+  name: "computed",
+  displayName: "Computed Strategy",
+  config: [],
+  events: ["` + string(schema.EventTypeTrade) + `"]
+};
+`
+	path := filepath.Join(t.TempDir(), "computed.js")
+	module, err := compileSource(path, []byte(source), int64(len(source)))
+	if err != nil {
+		t.Fatalf("compileSource: %v", err)
+	}
+	if module.Name != "computed" {
+		t.Fatalf("expected module name computed, got %q", module.Name)
+	}
+}
+
+func TestCompileSourceMetadataValidationDiagnostics(t *testing.T) {
 	dir := t.TempDir()
 	source := `
 module.exports = {
@@ -315,14 +446,7 @@ module.exports = {
 };
 `
 	path := filepath.Join(dir, "validator.js")
-	if err := os.WriteFile(path, []byte(source), 0o600); err != nil {
-		t.Fatalf("write module: %v", err)
-	}
-	info, err := os.Stat(path)
-	if err != nil {
-		t.Fatalf("stat module: %v", err)
-	}
-	if _, err := compileModule(path, info); err == nil {
+	if _, err := compileSource(path, []byte(source), int64(len(source))); err == nil {
 		t.Fatalf("expected metadata validation error")
 	} else {
 		diagErr, ok := AsDiagnosticError(err)
@@ -347,7 +471,7 @@ module.exports = {
 	}
 }
 
-func TestCompileModuleInjectsDryRunField(t *testing.T) {
+func TestCompileSourceInjectsDryRunField(t *testing.T) {
 	dir := t.TempDir()
 	source := `
 module.exports = {
@@ -365,16 +489,9 @@ module.exports = {
 };
 `
 	path := filepath.Join(dir, "threshold.js")
-	if err := os.WriteFile(path, []byte(source), 0o600); err != nil {
-		t.Fatalf("write module: %v", err)
-	}
-	info, err := os.Stat(path)
+	module, err := compileSource(path, []byte(source), int64(len(source)))
 	if err != nil {
-		t.Fatalf("stat module: %v", err)
-	}
-	module, err := compileModule(path, info)
-	if err != nil {
-		t.Fatalf("compileModule: %v", err)
+		t.Fatalf("compileSource: %v", err)
 	}
 	foundDryRun := false
 	for _, field := range module.Metadata.Config {
@@ -844,3 +961,129 @@ func TestCloneTagsWithFallback(t *testing.T) {
 		})
 	}
 }
+
+func TestModuleHashMatchesRegistryFormat(t *testing.T) {
+	source := []byte(sampleModule)
+	sum := sha256.Sum256(source)
+	expected := "sha256:" + hex.EncodeToString(sum[:])
+	if got := moduleHash(source); got != expected {
+		t.Fatalf("expected %s, got %s", expected, got)
+	}
+	if !isHashIdentifier(moduleHash(nil)) {
+		t.Fatalf("expected hash of empty source to be a valid identifier")
+	}
+}
+
+func TestLoadRegistryDecodesFromStream(t *testing.T) {
+	dir := t.TempDir()
+	path := filepath.Join(dir, "registry.json")
+
+	if err := os.WriteFile(path, []byte("  \n"), 0o600); err != nil {
+		t.Fatalf("write registry: %v", err)
+	}
+	reg, err := loadRegistry(dir)
+	if err != nil {
+		t.Fatalf("loadRegistry blank: %v", err)
+	}
+	if reg == nil || len(reg) != 0 {
+		t.Fatalf("expected empty registry for blank manifest, got %+v", reg)
+	}
+
+	if err := os.WriteFile(path, []byte(`{"noop":{"tags":{},"hashes":{}}}`+"\n"), 0o600); err != nil {
+		t.Fatalf("write registry: %v", err)
+	}
+	reg, err = loadRegistry(dir)
+	if err != nil {
+		t.Fatalf("loadRegistry: %v", err)
+	}
+	if _, ok := reg["noop"]; !ok {
+		t.Fatalf("expected noop entry, got %+v", reg)
+	}
+
+	if err := os.WriteFile(path, []byte(`{} {}`), 0o600); err != nil {
+		t.Fatalf("write registry: %v", err)
+	}
+	if _, err := loadRegistry(dir); err == nil {
+		t.Fatalf("expected trailing data to be rejected")
+	}
+}
+
+func TestStoreDuplicateRevisionLeavesSingleFile(t *testing.T) {
+	dir := t.TempDir()
+	if err := os.WriteFile(filepath.Join(dir, "registry.json"), []byte("{}"), 0o600); err != nil {
+		t.Fatalf("write registry: %v", err)
+	}
+	loader, err := NewLoader(dir)
+	if err != nil {
+		t.Fatalf("NewLoader: %v", err)
+	}
+	first, err := loader.Store([]byte(sampleModule), ModuleWriteOptions{PromoteLatest: true})
+	if err != nil {
+		t.Fatalf("first Store: %v", err)
+	}
+	second, err := loader.Store([]byte(sampleModule), ModuleWriteOptions{Tag: "stable"})
+	if err != nil {
+		t.Fatalf("second Store: %v", err)
+	}
+	if first.Module.Path != second.Module.Path {
+		t.Fatalf("expected duplicate upload to reuse %s, got %s", first.Module.Path, second.Module.Path)
+	}
+
+	rootEntries, err := os.ReadDir(dir)
+	if err != nil {
+		t.Fatalf("read root: %v", err)
+	}
+	for _, entry := range rootEntries {
+		if strings.HasSuffix(entry.Name(), ".js") {
+			t.Fatalf("unexpected stray file %s in strategy root", entry.Name())
+		}
+	}
+	revisionEntries, err := os.ReadDir(filepath.Dir(first.Module.Path))
+	if err != nil {
+		t.Fatalf("read revision dir: %v", err)
+	}
+	if len(revisionEntries) != 1 || revisionEntries[0].Name() != "noop.js" {
+		t.Fatalf("expected only noop.js in revision dir, got %v", revisionEntries)
+	}
+}
+
+func TestPickReplacementLatest(t *testing.T) {
+	cases := []struct {
+		name string
+		tags map[string]string
+		want string
+	}{
+		{name: "empty", tags: nil, want: ""},
+		{name: "only latest", tags: map[string]string{"latest": "sha256:a"}, want: ""},
+		{
+			name: "lowest tag wins",
+			tags: map[string]string{"latest": "sha256:a", "v2.0.0": "sha256:b", "v1.0.0": "sha256:c", "stable": "sha256:d"},
+			want: "sha256:d",
+		},
+	}
+	for _, tc := range cases {
+		if got := pickReplacementLatest(tc.tags); got != tc.want {
+			t.Fatalf("%s: expected %q, got %q", tc.name, tc.want, got)
+		}
+	}
+}
+
+func TestIsRevisionPath(t *testing.T) {
+	digest := strings.Repeat("a", 64)
+	cases := []struct {
+		rel  string
+		want bool
+	}{
+		{rel: "noop/" + digest + "/noop.js", want: true},
+		{rel: "noop/" + digest + "/other.js", want: false},
+		{rel: "noop/" + digest + "/noop.jsx", want: false},
+		{rel: "noop/" + strings.Repeat("b", 64) + "/noop.js", want: false},
+		{rel: "noopx/" + digest + "/noop.js", want: false},
+		{rel: "noop/" + digest + "noop.js", want: false},
+	}
+	for _, tc := range cases {
+		if got := isRevisionPath(tc.rel, "noop", digest); got != tc.want {
+			t.Fatalf("isRevisionPath(%q) = %v, want %v", tc.rel, got, tc.want)
+		}
+	}
+}
@@ -2007,12 +2007,12 @@ func (m *Manager) RegistryExport() (js.RegistrySnapshot, []RevisionUsageSummary,
 	return snapshot, usage, nil
 }
 
-// StrategySource retrieves the raw JavaScript source for the named strategy.
-func (m *Manager) StrategySource(name string) ([]byte, error) {
+// OpenStrategySource opens the raw JavaScript source for the named strategy for streaming.
+func (m *Manager) OpenStrategySource(name string) (io.ReadCloser, error) {
 	if m == nil || m.jsLoader == nil {
 		return nil, js.ErrModuleNotFound
 	}
-	source, err := m.jsLoader.Read(name)
+	source, err := m.jsLoader.Open(name)
 	if err != nil {
 		return nil, fmt.Errorf("strategy source %q: %w", name, err)
 	}
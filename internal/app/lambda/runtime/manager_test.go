@@ -130,9 +130,14 @@ func TestManagerRefreshJavaScriptStrategies(t *testing.T) {
 		t.Fatalf("expected refreshed metadata, got %q", meta.Description)
 	}
 
-	source, err := mgr.StrategySource("alpha")
+	reader, err := mgr.OpenStrategySource("alpha")
 	if err != nil {
-		t.Fatalf("StrategySource: %v", err)
+		t.Fatalf("OpenStrategySource: %v", err)
+	}
+	source, err := io.ReadAll(reader)
+	_ = reader.Close()
+	if err != nil {
+		t.Fatalf("read strategy source: %v", err)
 	}
 	if !strings.Contains(string(source), "Alpha v2") {
 		t.Fatalf("expected updated source, got %q", string(source))
@@ -417,3 +417,13 @@ func TestTryReturnEventInst(t *testing.T) {
 		t.Error("TryReturnEventInst returned false")
 	}
 }
+
+func TestEncodeJSONSkipsHTMLEscapingAndNewline(t *testing.T) {
+	data, err := EncodeJSON(map[string]string{"html": "<a&b>"})
+	if err != nil {
+		t.Fatalf("EncodeJSON: %v", err)
+	}
+	if got, want := string(data), `{"html":"<a&b>"}`; got != want {
+		t.Fatalf("expected %s, got %s", want, got)
+	}
+}
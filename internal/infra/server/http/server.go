@@ -734,14 +734,15 @@ func (s *httpServer) getStrategyModuleSource(w http.ResponseWriter, _ *http.Requ
 		writeError(w, http.StatusServiceUnavailable, "strategy manager unavailable")
 		return
 	}
-	source, err := s.manager.StrategySource(name)
+	source, err := s.manager.OpenStrategySource(name)
 	if err != nil {
 		s.writeStrategyModuleError(w, err)
 		return
 	}
+	defer func() { _ = source.Close() }()
 	w.Header().Set("Content-Type", "application/javascript; charset=utf-8")
 	w.WriteHeader(http.StatusOK)
-	_, _ = w.Write(source)
+	_, _ = io.Copy(w, source)
 }
 
 func (s *httpServer) refreshStrategies(w http.ResponseWriter, r *http.Request) {